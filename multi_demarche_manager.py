@@ -4,13 +4,34 @@ Toutes les démarches utilisent le même token API (API_TOKEN_DNC).
 """
 
 import os
+import sys
 import json
 import re
 import time
-from typing import Dict, List, Any, Optional
+import argparse
+import traceback
+import concurrent.futures
+import types
+import requests
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+try:
+    import queries_config
+except ImportError:
+    queries_config = None
+
+# Parser JSON natif (orjson) si disponible, sinon module json standard
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Motif des variables d'environnement dans la configuration : ${VAR_NAME}
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
 @dataclass
 class DemarcheConfig:
     """Configuration d'une démarche."""
@@ -44,8 +65,17 @@ class MultiDemarcheManager:
         Args:
             config_file: Chemin vers le fichier de configuration JSON
         """
-        load_dotenv()
+        # Charger .env uniquement s'il existe (évite la recherche dans les répertoires parents)
+        for dotenv_path in ('.env', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')):
+            if os.path.exists(dotenv_path):
+                load_dotenv(dotenv_path)
+                break
+
         self.config_file = config_file
+
+        # Session HTTP des validations de token, créée au premier besoin
+        self._session: Optional[requests.Session] = None
+
         self.config = self._load_config()
         self.demarches = self._load_demarches()
 
@@ -60,34 +90,86 @@ class MultiDemarcheManager:
         Returns:
             str: Texte avec les variables résolues
         """
-
-        if not isinstance(text, str):
+        if not isinstance(text, str) or '${' not in text:
             return text
 
-        def replace_var(match):
-            var_name = match.group(1)
-            return os.getenv(var_name, f"${{{var_name}}}")  # Garde la variable si non trouvée
-
-        return re.sub(r'\$\{([^}]+)\}', replace_var, text)
-
-    def _resolve_dict_env_vars(self, data: Any) -> Any:
+        # Parcours manuel (find) : plus rapide que re.sub sur des chaînes courtes
+        out = []
+        i = 0
+        while True:
+            j = text.find('${', i)
+            if j < 0:
+                out.append(text[i:])
+                break
+            out.append(text[i:j])
+            k = text.find('}', j + 2)
+            if k < 0:
+                out.append(text[j:])
+                break
+            var_name = text[j + 2:k]
+            value = os.environ.get(var_name) if var_name else None
+            # Garde la variable si non trouvée
+            out.append(text[j:k + 1] if value is None else value)
+            i = k + 1
+
+        return ''.join(out)
+
+    def _resolve_dict_env_vars(self, data: Any, memo: Optional[Dict[int, Any]] = None) -> Any:
         """
-        Résout récursivement les variables d'environnement dans un dictionnaire.
+        Résout les variables d'environnement dans un dictionnaire.
+
+        Parcours itératif (pile explicite) : les dictionnaires et listes sont
+        modifiés sur place, seules les chaînes contenant ${...} sont remplacées.
+        Les conteneurs partagés ne sont parcourus qu'une fois (mémo par id),
+        et chaque chaîne brute n'est résolue qu'une seule fois.
 
         Args:
             data: Données à traiter (dict, list, str, etc.)
+            memo: Conteneurs déjà traités, indexés par id()
 
         Returns:
             Données avec les variables d'environnement résolues
         """
-        if isinstance(data, dict):
-            return {key: self._resolve_dict_env_vars(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._resolve_dict_env_vars(item) for item in data]
-        elif isinstance(data, str):
+        if isinstance(data, str):
             return self._resolve_env_vars(data)
-        else:
-            return data
+
+        if memo is None:
+            memo = {}
+        resolved_strings: Dict[str, str] = {}
+
+        stack = [(data, None, None)]
+        while stack:
+            node, parent, key = stack.pop()
+            if isinstance(node, (dict, list)):
+                # Déjà traité (sous-arbre partagé ou cycle)
+                if id(node) in memo:
+                    continue
+                memo[id(node)] = node
+                items = node.items() if isinstance(node, dict) else enumerate(node)
+                for k, v in items:
+                    stack.append((v, node, k))
+            elif isinstance(node, str) and '${' in node:
+                value = resolved_strings.get(node)
+                if value is None:
+                    value = resolved_strings[node] = self._resolve_env_vars(node)
+                parent[key] = value
+
+        return data
+
+    def _read_config_file(self) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Lit et parse le fichier de configuration.
+
+        Returns:
+            tuple: (configuration brute, noms des variables ${VAR} référencées)
+        """
+        # Lecture binaire : orjson attend des bytes
+        with open(self.config_file, 'rb') as f:
+            raw = f.read()
+        config = _json_loads(raw)
+        referenced_vars = set(_ENV_VAR_RE.findall(raw.decode('utf-8')))
+
+        return config, referenced_vars
 
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -97,11 +179,18 @@ class MultiDemarcheManager:
             dict: Configuration chargée avec variables d'environnement résolues
         """
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config, referenced_vars = self._read_config_file()
+
+            # Signaler d'un coup toutes les variables manquantes, avant tout appel réseau
+            missing_vars = sorted(var for var in referenced_vars if var not in os.environ)
+            if missing_vars:
+                raise ValueError(
+                    f"Variables d'environnement manquantes dans {self.config_file} : {', '.join(missing_vars)}"
+                )
 
-            # Résoudre les variables d'environnement
-            config = self._resolve_dict_env_vars(config)
+            # Résoudre les variables d'environnement (inutile si aucun ${...} dans le fichier)
+            if referenced_vars:
+                config = self._resolve_dict_env_vars(config)
 
             # Validation de base
             required_sections = ['grist', 'demarches']
@@ -109,6 +198,8 @@ class MultiDemarcheManager:
                 if section not in config:
                     raise ValueError(f"Section manquante dans la configuration : {section}")
 
+            self._grist_config = config['grist']
+
             return config
 
         except FileNotFoundError:
@@ -126,12 +217,8 @@ class MultiDemarcheManager:
         demarches = []
 
         for demarche_data in self.config['demarches']:
-            # Vérifier que le token a été résolu
+            # Les variables ${...} manquantes sont déjà rejetées par _load_config
             api_token = demarche_data.get('api_token', '')
-            if api_token.startswith('${'):
-                print(f"⚠️  Attention: Token non résolu pour la démarche {demarche_data['number']}")
-                print(f"   Variable d'environnement manquante : {api_token}")
-                continue
 
             demarches.append(DemarcheConfig(
                 number=demarche_data['number'],
@@ -143,6 +230,10 @@ class MultiDemarcheManager:
                 filters=demarche_data.get('filters', {})
             ))
 
+        # Index pour des recherches en O(1)
+        self._by_number: Dict[int, DemarcheConfig] = {d.number: d for d in demarches}
+        self._enabled: List[DemarcheConfig] = [d for d in demarches if d.enabled]
+
         return demarches
 
     def get_enabled_demarches(self) -> List[DemarcheConfig]:
@@ -152,7 +243,7 @@ class MultiDemarcheManager:
         Returns:
             list: Liste des démarches activées
         """
-        return [d for d in self.demarches if d.enabled]
+        return self._enabled
 
     def get_demarche_config(self, demarche_number: int) -> Optional[DemarcheConfig]:
         """
@@ -164,33 +255,24 @@ class MultiDemarcheManager:
         Returns:
             DemarcheConfig ou None si non trouvé
         """
-        for demarche in self.demarches:
-            if demarche.number == demarche_number:
-                return demarche
-        return None
+        return self._by_number.get(demarche_number)
 
-    def get_grist_config(self) -> Dict[str, str]:
+    def get_grist_config(self) -> Mapping[str, str]:
         """
         Retourne la configuration Grist.
 
         Returns:
-            dict: Configuration Grist
+            Mapping: Vue en lecture seule de la configuration Grist
         """
-        grist_config = self.config['grist'].copy()
-
-        # Vérifier que les variables ont été résolues
-        for key, value in grist_config.items():
-            if isinstance(value, str) and value.startswith('${'):
-                print(f"⚠️  Attention: Variable Grist non résolue : {key} = {value}")
+        return types.MappingProxyType(self._grist_config)
 
-        return grist_config
-
-    def set_environment_for_demarche(self, demarche_number: int) -> bool:
+    def set_environment_for_demarche(self, demarche_number: int, validate: bool = False) -> bool:
         """
         Configure les variables d'environnement pour une démarche spécifique.
 
         Args:
             demarche_number: Numéro de la démarche
+            validate: Si True, vérifie le token par une requête de test à l'API
 
         Returns:
             bool: True si la configuration a réussi, False sinon
@@ -201,90 +283,56 @@ class MultiDemarcheManager:
             return False
 
         # Vérifier que le token est valide
-        if not demarche_config.api_token or demarche_config.api_token.startswith('${'):
+        if not demarche_config.api_token:
             print(f"❌ Token API invalide pour la démarche {demarche_number}")
             return False
 
         print(f"🔄 Reconfiguration pour la démarche {demarche_number}...")
         print(f"   Token: {demarche_config.api_token[:8]}...{demarche_config.api_token[-8:]}")
 
-        # Configurer les variables d'environnement pour l'API DS
-        os.environ['DEMARCHES_API_TOKEN'] = demarche_config.api_token
-        os.environ['DEMARCHES_API_URL'] = demarche_config.api_url
-        os.environ['DEMARCHE_NUMBER'] = str(demarche_number)
-
-        # IMPORTANT : Forcer la mise à jour du cache dans queries_config
-        try:
-            import queries_config
-            queries_config.API_TOKEN = demarche_config.api_token
-            queries_config.API_URL = demarche_config.api_url
-
-            # Si la classe DemarcheAPIConfig existe, l'utiliser
-            if hasattr(queries_config, 'DemarcheAPIConfig'):
-                queries_config.DemarcheAPIConfig.set_current_api_config(
-                    demarche_config.api_token,
-                    demarche_config.api_url
-                )
-
-            # FORCER LE RECHARGEMENT DES MODULES CRITIQUES
-            import importlib
-            import sys
-
-            # Recharger queries_config pour forcer la prise en compte du nouveau token
-            if 'queries_config' in sys.modules:
-                importlib.reload(queries_config)
-                queries_config.API_TOKEN = demarche_config.api_token
-                queries_config.API_URL = demarche_config.api_url
-
-            # Recharger queries_graphql qui utilise le token
-            if 'queries_graphql' in sys.modules:
-                import queries_graphql
-                importlib.reload(queries_graphql)
-
-            # Recharger schema_utils qui utilise aussi le token
-            if 'schema_utils' in sys.modules:
-                import schema_utils
-                importlib.reload(schema_utils)
-
-            print(f"   🔄 Modules rechargés avec le nouveau token")
-
-        except ImportError:
-            pass
-
-        # Forcer le rechargement de la dotenv si elle est en cache
-        try:
-            from dotenv import load_dotenv
-            load_dotenv(override=True)  # override=True force le rechargement
-        except ImportError:
-            pass
+        # Source unique du token pour queries_graphql / schema_utils (lu à chaque appel)
+        if queries_config is not None:
+            queries_config.DemarcheAPIConfig.set_current_api_config(
+                demarche_config.api_token,
+                demarche_config.api_url
+            )
 
-        # Configurer les variables Grist
         grist_config = self.get_grist_config()
-        os.environ['GRIST_BASE_URL'] = grist_config['base_url']
-        os.environ['GRIST_API_KEY'] = grist_config['api_key']
-        os.environ['GRIST_DOC_ID'] = grist_config['doc_id']
-
-        # Configurer les filtres
         filters = demarche_config.filters
-        os.environ['DATE_DEPOT_DEBUT'] = filters.get('date_depot_debut', '')
-        os.environ['DATE_DEPOT_FIN'] = filters.get('date_depot_fin', '')
-        os.environ['STATUTS_DOSSIERS'] = ','.join(filters.get('statuts_dossiers', []))
-        os.environ['GROUPES_INSTRUCTEURS'] = ','.join(str(g) for g in filters.get('groupes_instructeurs', []))
-
-        # Configurer les paramètres de synchronisation
         sync_config = demarche_config.sync_config
-        os.environ['BATCH_SIZE'] = str(sync_config.get('batch_size', 50))
-        os.environ['MAX_WORKERS'] = str(sync_config.get('max_workers', 3))
-        os.environ['PARALLEL'] = str(sync_config.get('parallel', True)).lower()
+        statuts_dossiers = ','.join(filters.get('statuts_dossiers', []))
+        groupes_instructeurs = ','.join(map(str, filters.get('groupes_instructeurs') or ()))
+
+        # Configurer toutes les variables d'environnement en une seule mise à jour
+        env_updates = {
+            # API DS
+            'DEMARCHES_API_TOKEN': demarche_config.api_token,
+            'DEMARCHES_API_URL': demarche_config.api_url,
+            'DEMARCHE_NUMBER': str(demarche_number),
+            # Grist
+            'GRIST_BASE_URL': grist_config['base_url'],
+            'GRIST_API_KEY': grist_config['api_key'],
+            'GRIST_DOC_ID': grist_config['doc_id'],
+            # Filtres
+            'DATE_DEPOT_DEBUT': filters.get('date_depot_debut', ''),
+            'DATE_DEPOT_FIN': filters.get('date_depot_fin', ''),
+            'STATUTS_DOSSIERS': statuts_dossiers,
+            'GROUPES_INSTRUCTEURS': groupes_instructeurs,
+            # Paramètres de synchronisation
+            'BATCH_SIZE': str(sync_config.get('batch_size', 50)),
+            'MAX_WORKERS': str(sync_config.get('max_workers', 3)),
+            'PARALLEL': str(sync_config.get('parallel', True)).lower(),
+        }
+        os.environ.update(env_updates)
 
         print(f"✅ Environnement configuré pour la démarche {demarche_number} - {demarche_config.name}")
 
+        # Sans validation explicite, une erreur d'authentification remontera lors de la synchronisation
+        if not validate:
+            return True
+
         # VALIDATION : Vérifier que le token est bien appliqué
-        import requests
-        headers = {
-            "Authorization": f"Bearer {demarche_config.api_token}",
-            "Content-Type": "application/json"
-        }
+        headers = {"Authorization": f"Bearer {demarche_config.api_token}"}
 
         # Test simple pour vérifier l'accès
         test_query = """
@@ -297,7 +345,7 @@ class MultiDemarcheManager:
         """
 
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 demarche_config.api_url,
                 json={"query": test_query, "variables": {"demarcheNumber": demarche_number}},
                 headers=headers,
@@ -323,23 +371,77 @@ class MultiDemarcheManager:
             print(f"   ⚠️  Impossible de valider le token: {str(e)}")
             return True  # Continuer quand même
 
-    def sync_all_demarches(self) -> List[SyncResult]:
+    def _get_session(self) -> requests.Session:
+        """
+        Retourne la session HTTP partagée par les validations de token
+        (une seule connexion TLS pour toutes les démarches).
+
+        Returns:
+            requests.Session: Session créée au premier appel
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({"Content-Type": "application/json"})
+        return self._session
+
+    def close(self):
+        """
+        Ferme la session HTTP des validations de token si elle a été créée.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def sync_all_demarches(self, validate_tokens: bool = False) -> List[SyncResult]:
         """
         Synchronise toutes les démarches activées.
 
+        Args:
+            validate_tokens: Si True, valide le token de chaque démarche avant synchronisation
+
         Returns:
             list: Liste des résultats de synchronisation
         """
         results = []
         enabled_demarches = self.get_enabled_demarches()
-
-        print(f"🚀 Démarrage de la synchronisation de {len(enabled_demarches)} démarches")
+        total = len(enabled_demarches)
+        # Synchronisation parallèle sur option uniquement (global_max_workers > 1 dans la configuration)
+        max_workers = self.config.get('global_max_workers', 1)
+
+        print(f"🚀 Démarrage de la synchronisation de {total} démarches")
+
+        if max_workers > 1 and total > 1 and self._can_sync_in_parallel(enabled_demarches):
+            print(f"⚡ Synchronisation parallèle ({max_workers} workers)")
+            start_time = time.time()
+
+            # Configuration (et validation éventuelle) séquentielle, puis synchronisations en parallèle.
+            # Les résultats sont rangés dans l'ordre des démarches.
+            results = [None] * total
+            futures = {}
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for i, demarche in enumerate(enabled_demarches):
+                    if self.set_environment_for_demarche(demarche.number, validate=validate_tokens):
+                        futures[executor.submit(self._sync_demarche_task, demarche, i + 1, total)] = i
+                    else:
+                        results[i] = SyncResult(
+                            demarche_number=demarche.number,
+                            demarche_name=demarche.name,
+                            success=False,
+                            dossiers_processed=0,
+                            errors=["Échec de la configuration de l'environnement"],
+                            duration_seconds=0
+                        )
+                for future, i in futures.items():
+                    results[i] = future.result()
+
+            self._print_sync_summary(results, wall_clock_seconds=time.time() - start_time)
+            return results
 
         for i, demarche in enumerate(enabled_demarches, 1):
-            print(f"\n📋 Synchronisation {i}/{len(enabled_demarches)}: {demarche.name} (#{demarche.number})")
+            print(f"\n📋 Synchronisation {i}/{total}: {demarche.name} (#{demarche.number})")
 
             # Configurer l'environnement pour cette démarche
-            if not self.set_environment_for_demarche(demarche.number):
+            if not self.set_environment_for_demarche(demarche.number, validate=validate_tokens):
                 results.append(SyncResult(
                     demarche_number=demarche.number,
                     demarche_name=demarche.name,
@@ -354,23 +456,58 @@ class MultiDemarcheManager:
             result = self._sync_single_demarche(demarche)
             results.append(result)
 
-            # Pause entre les démarches pour éviter les problèmes de cache
-            if i < len(enabled_demarches):
-                print(f"⏸️  Pause de 2 secondes avant la démarche suivante...")
-                time.sleep(2)
-
         # Afficher le résumé
         self._print_sync_summary(results)
 
         return results
 
-    def sync_specific_demarches(self, demarche_numbers: List[int], force_disabled: bool = False) -> List[SyncResult]:
+    def _sync_demarche_task(self, demarche: DemarcheConfig, index: int, total: int) -> SyncResult:
+        """
+        Tâche exécutée par un worker en mode parallèle : affiche l'en-tête
+        de la démarche puis la synchronise.
+
+        Args:
+            demarche: Configuration de la démarche
+            index: Position de la démarche (à partir de 1)
+            total: Nombre de démarches à synchroniser
+
+        Returns:
+            SyncResult: Résultat de la synchronisation
+        """
+        print(f"\n📋 Synchronisation {index}/{total}: {demarche.name} (#{demarche.number})")
+        result = self._sync_single_demarche(demarche)
+        status = "✅" if result.success else "❌"
+        print(f"{status} Fin de la synchronisation {index}/{total}: {demarche.name} (#{demarche.number}) - {result.duration_seconds:.1f}s")
+        return result
+
+    def _can_sync_in_parallel(self, demarches: List[DemarcheConfig]) -> bool:
+        """
+        Indique si des démarches peuvent être synchronisées en parallèle.
+
+        Le token/URL (DemarcheAPIConfig) et les filtres (variables d'environnement)
+        sont globaux au processus : ils doivent être identiques pour toutes les démarches.
+
+        Args:
+            demarches: Démarches à synchroniser
+
+        Returns:
+            bool: True si toutes les démarches partagent le même token, URL et filtres
+        """
+        first = demarches[0]
+        return all(
+            d.api_token == first.api_token and d.api_url == first.api_url and d.filters == first.filters
+            for d in demarches[1:]
+        )
+
+    def sync_specific_demarches(self, demarche_numbers: List[int], force_disabled: bool = False,
+                                validate_tokens: bool = False) -> List[SyncResult]:
         """
         Synchronise des démarches spécifiques.
 
         Args:
             demarche_numbers: Liste des numéros de démarches à synchroniser
             force_disabled: Si True, synchronise même les démarches désactivées
+            validate_tokens: Si True, valide le token de chaque démarche avant synchronisation
 
         Returns:
             list: Liste des résultats de synchronisation
@@ -403,7 +540,7 @@ class MultiDemarcheManager:
             print(f"\n📋 Synchronisation: {demarche_config.name} (#{demarche_number})")
 
             # Configurer l'environnement pour cette démarche
-            if not self.set_environment_for_demarche(demarche_number):
+            if not self.set_environment_for_demarche(demarche_number, validate=validate_tokens):
                 results.append(SyncResult(
                     demarche_number=demarche_number,
                     demarche_name=demarche_config.name,
@@ -418,11 +555,6 @@ class MultiDemarcheManager:
             result = self._sync_single_demarche(demarche_config)
             results.append(result)
 
-            # Pause entre les démarches pour éviter les problèmes de cache
-            if demarche_number != demarche_numbers[-1]:  # Pas de pause après la dernière
-                print(f"⏸️  Pause de 2 secondes avant la démarche suivante...")
-                time.sleep(2)
-
         # Afficher le résumé
         if results:
             self._print_sync_summary(results)
@@ -495,23 +627,31 @@ class MultiDemarcheManager:
                 duration_seconds=duration
             )
 
-    def _print_sync_summary(self, results: List[SyncResult]):
+    def _print_sync_summary(self, results: List[SyncResult], wall_clock_seconds: Optional[float] = None):
         """
         Affiche un résumé des résultats de synchronisation.
 
         Args:
             results: Liste des résultats
+            wall_clock_seconds: Durée réelle en mode parallèle (sinon somme des durées)
         """
         print(f"\n{'='*60}")
         print("📊 RÉSUMÉ DE LA SYNCHRONISATION")
         print(f"{'='*60}")
 
-        successful = [r for r in results if r.success]
-        failed = [r for r in results if not r.success]
+        # Répartition et durée totale en un seul parcours
+        successful, failed, total_duration = [], [], 0.0
+        for r in results:
+            (successful if r.success else failed).append(r)
+            total_duration += r.duration_seconds
 
         print(f"✅ Synchronisations réussies : {len(successful)}")
         print(f"❌ Synchronisations échouées : {len(failed)}")
-        print(f"⏱️  Durée totale : {sum(r.duration_seconds for r in results):.1f} secondes")
+        if wall_clock_seconds is None:
+            print(f"⏱️  Durée totale : {total_duration:.1f} secondes")
+        else:
+            print(f"⏱️  Durée totale : {wall_clock_seconds:.1f} secondes "
+                  f"(parallèle, cumul des démarches : {total_duration:.1f} secondes)")
 
         if successful:
             print(f"\n🎉 Démarches synchronisées avec succès :")
@@ -539,7 +679,7 @@ class MultiDemarcheManager:
         # Vérifier Grist
         grist_config = self.get_grist_config()
         for key in ['base_url', 'api_key', 'doc_id']:
-            if not grist_config.get(key) or grist_config[key].startswith('${'):
+            if not grist_config.get(key):
                 print(f"❌ Configuration Grist incomplète : {key}")
                 valid = False
 
@@ -552,7 +692,7 @@ class MultiDemarcheManager:
         print(f"📋 Démarches : {enabled_count}/{total_count} activées")
 
         for demarche in self.demarches:
-            if not demarche.api_token or demarche.api_token.startswith('${'):
+            if not demarche.api_token:
                 print(f"❌ Token manquant pour la démarche {demarche.number} - {demarche.name}")
                 valid = False
             else:
@@ -570,8 +710,6 @@ def main():
     """
     Point d'entrée principal pour la synchronisation multi-démarche.
     """
-    import argparse
-
     parser = argparse.ArgumentParser(description='Synchronisation multi-démarche DNC Occitanie vers Grist')
     parser.add_argument('--demarches', type=str, help='Numéros de démarches séparés par des virgules (ex: 135754,135749)')
     parser.add_argument('--force', action='store_true', help='Forcer la synchronisation des démarches désactivées')
@@ -579,6 +717,7 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Mode test (validation uniquement)')
     parser.add_argument('--config', type=str, default='config.json', help='Fichier de configuration')
     parser.add_argument('--debug', action='store_true', help='Activer les logs de debug')
+    parser.add_argument('--validate-tokens', action='store_true', help="Valider le token de chaque démarche par une requête de test avant synchronisation")
 
     args = parser.parse_args()
 
@@ -606,7 +745,7 @@ def main():
             print(f"📋 Démarches disponibles :")
             for d in manager.demarches:
                 status = "✅ activée" if d.enabled else "⚪ désactivée"
-                token_ok = "🔑 OK" if d.api_token and not d.api_token.startswith('${') else "❌ token manquant"
+                token_ok = "🔑 OK" if d.api_token else "❌ token manquant"
                 print(f"   {d.number}: {d.name} - {status} - {token_ok}")
 
         # Mode validation uniquement
@@ -635,7 +774,11 @@ def main():
                         demarche_numbers.append(int(cleaned))
 
                 print(f"🎯 Démarches sélectionnées : {demarche_numbers}")
-                results = manager.sync_specific_demarches(demarche_numbers, force_disabled=args.force)
+                results = manager.sync_specific_demarches(
+                    demarche_numbers,
+                    force_disabled=args.force,
+                    validate_tokens=args.validate_tokens
+                )
             except ValueError as e:
                 print(f"❌ Erreur dans les numéros de démarches : {args.demarches}")
                 print(f"   Format attendu : 135754,135749 (sans espaces)")
@@ -643,7 +786,9 @@ def main():
                 return 1
         else:
             # Synchroniser toutes les démarches activées
-            results = manager.sync_all_demarches()
+            results = manager.sync_all_demarches(validate_tokens=args.validate_tokens)
+
+        manager.close()
 
         # Vérifier si au moins une synchronisation a réussi
         success_count = sum(1 for r in results if r.success)
@@ -657,12 +802,10 @@ def main():
     except Exception as e:
         print(f"💥 Erreur fatale : {e}")
         if args.debug:
-            import traceback
             traceback.print_exc()
         else:
             print("💡 Utilisez --debug pour plus de détails")
         return 1
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
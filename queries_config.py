@@ -1,9 +1,43 @@
 import os
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 
-# Charger les variables d'environnement
-load_dotenv()
+# Charger les variables d'environnement, uniquement si un .env existe
+# (évite la recherche dans les répertoires parents à chaque import)
+for _dotenv_path in ('.env', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')):
+    if os.path.exists(_dotenv_path):
+        load_dotenv(_dotenv_path)
+        break
 
 # Récupérer le token depuis les variables d'environnement
 API_TOKEN = os.getenv("DEMARCHES_API_TOKEN")
-API_URL = os.getenv("DEMARCHES_API_URL", "https://demarche.numerique.gouv.fr/api/v2/graphql")
\ No newline at end of file
+API_URL = os.getenv("DEMARCHES_API_URL", "https://demarche.numerique.gouv.fr/api/v2/graphql")
+
+
+@dataclass(frozen=True)
+class DemarcheAPIConfig:
+    """
+    Token et URL de l'API Démarches Simplifiées en cours d'utilisation.
+    Source unique de vérité : les modules lisent la configuration à chaque appel
+    via DemarcheAPIConfig.current() au lieu de la figer à l'import.
+    """
+    token: Optional[str]
+    url: str
+
+    @classmethod
+    def current(cls) -> "DemarcheAPIConfig":
+        """Retourne la configuration API courante."""
+        return _current_api_config
+
+    @classmethod
+    def set_current_api_config(cls, token: str, url: str) -> None:
+        """Change la configuration API courante (changement de démarche)."""
+        global _current_api_config, API_TOKEN, API_URL
+        _current_api_config = cls(token, url)
+        # Compatibilité avec les imports directs de API_TOKEN / API_URL
+        API_TOKEN = token
+        API_URL = url
+
+
+_current_api_config = DemarcheAPIConfig(API_TOKEN, API_URL)
@@ -3,8 +3,9 @@ import json
 from requests.adapters import HTTPAdapter  # ✅ NOUVEAU
 from urllib3.util.retry import Retry  # ✅ NOUVEAU
 import time  # ✅ NOUVEAU
+import threading
 from typing import Dict, Any, List, Optional
-from queries_config import API_TOKEN, API_URL
+from queries_config import DemarcheAPIConfig
 
 # Requêtes GraphQL (fragmentées en quelques constantes)
 # Pour les fragments communs
@@ -549,6 +550,7 @@ fragment DossierFragment on Dossier {
 
 # ✅ SESSION GLOBALE (créée une seule fois)
 _session = None
+_session_lock = threading.Lock()
 
 def get_session_with_retries():
     """
@@ -558,20 +560,24 @@ def get_session_with_retries():
     global _session
     
     if _session is None:
-        print("[RETRY] Création session avec retry automatique (3 tentatives, backoff 1s)")
-        _session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"],
-            raise_on_status=False
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        _session.mount("https://", adapter)
-        _session.mount("http://", adapter)
+        # Verrou : plusieurs threads peuvent demander la session en même temps
+        with _session_lock:
+            if _session is None:
+                print("[RETRY] Création session avec retry automatique (3 tentatives, backoff 1s)")
+                session = requests.Session()
+                
+                retry_strategy = Retry(
+                    total=3,
+                    backoff_factor=1,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["GET", "POST"],
+                    raise_on_status=False
+                )
+                
+                adapter = HTTPAdapter(max_retries=retry_strategy)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
     
     return _session
 
@@ -582,7 +588,8 @@ def get_dossier(dossier_number: int) -> Dict[str, Any]:
     Filtre les champs HeaderSectionChamp et ExplicationChamp.
     Ignore les erreurs de permission.
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré. Définissez DEMARCHES_API_TOKEN dans le fichier .env")
     
     # Variables pour la requête
@@ -597,14 +604,14 @@ def get_dossier(dossier_number: int) -> Dict[str, Any]:
     
     # En-têtes pour la requête
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     
     # Exécution de la requête
     session = get_session_with_retries()
     response = session.post(
-        API_URL,
+        api_config.url,
         json={"query": query_get_dossier, "variables": variables},
         headers=headers
     )
@@ -667,7 +674,8 @@ def get_demarche(demarche_number: int) -> Dict[str, Any]:
     Récupère les détails d'une démarche avec tous ses dossiers accessibles.
     Ignore les erreurs de permission sur certains dossiers ou champs.
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré. Définissez DEMARCHES_API_TOKEN dans le fichier .env")
     
     # Variables pour la requête
@@ -683,13 +691,13 @@ def get_demarche(demarche_number: int) -> Dict[str, Any]:
     }
     
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     # Exécution de la requête avec retry automatique
     session = get_session_with_retries()
     response = session.post(
-        API_URL,
+        api_config.url,
         json={"query": query_get_demarche, "variables": variables},
         headers=headers
     )
@@ -788,7 +796,8 @@ def get_demarche_dossiers_filtered(
     
     Les autres filtres seront appliqués côté client sur le résultat réduit.
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré.")
     
     # Seuls les filtres côté serveur qui fonctionnent
@@ -828,7 +837,7 @@ def get_demarche_dossiers_filtered(
     }
     
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     
@@ -914,7 +923,7 @@ def get_demarche_dossiers_filtered(
     # Exécution de la requête avec retry automatique
     session = get_session_with_retries()  # ✅ AJOUTE CETTE LIGNE
     response = session.post(
-        API_URL,
+        api_config.url,
         json={"query": query_get_demarche, "variables": variables},
         headers=headers
     )
@@ -949,7 +958,7 @@ def get_demarche_dossiers_filtered(
             
             session = get_session_with_retries()  # ✅ AJOUTE
             next_response = session.post(  # ✅ CHANGE requests → session
-                API_URL,
+                api_config.url,
                 json={"query": query_get_demarche, "variables": variables},
                 headers=headers
             )
@@ -1083,14 +1092,15 @@ def test_working_filter():
         "createdSince": "2025-06-15T00:00:00Z"
     }
     
+    api_config = DemarcheAPIConfig.current()
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     
     session = get_session_with_retries()  # ✅ AJOUTE
     response = session.post(
-        API_URL,
+        api_config.url,
         json={"query": query, "variables": variables},
         headers=headers
     )
@@ -1153,14 +1163,16 @@ def get_dossier_geojson(dossier_number: int) -> Dict[str, Any]:
     """
     Récupère les données géométriques d'un dossier au format GeoJSON.
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré. Définissez DEMARCHES_API_TOKEN dans le fichier .env")
     
-    base_url = API_URL.split('/api/')[0] if '/api/' in API_URL else "https://www.demarches-simplifiees.fr"
+    api_url = api_config.url
+    base_url = api_url.split('/api/')[0] if '/api/' in api_url else "https://www.demarches-simplifiees.fr"
     url = f"{base_url}/dossiers/{dossier_number}/geojson"
     
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Accept": "application/json"
     }
     
@@ -14,7 +14,7 @@ import json
 from typing import Dict, List, Any, Tuple, Optional, Set
 
 # Importer les configurations nécessaires
-from queries_config import API_TOKEN, API_URL
+from queries_config import DemarcheAPIConfig
 
 # ========================================
 # DÉTECTION DU TYPE DE DEMANDEUR
@@ -31,7 +31,8 @@ def detect_demandeur_type(demarche_number: int) -> Optional[str]:
     Returns:
         "PersonnePhysique" | "PersonneMorale" | None (si aucun dossier)
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré")
     
     # Requête pour récupérer juste le premier dossier
@@ -52,13 +53,13 @@ def detect_demandeur_type(demarche_number: int) -> Optional[str]:
     """
     
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     
     try:
         response = requests.post(
-            API_URL,
+            api_config.url,
             json={"query": query, "variables": {"demarcheNumber": int(demarche_number)}},
             headers=headers,
             timeout=30
@@ -226,7 +227,8 @@ def get_demarche_schema(demarche_number):
     Returns:
         dict: Structure complète des descripteurs de champs et d'annotations
     """
-    if not API_TOKEN:
+    api_config = DemarcheAPIConfig.current()
+    if not api_config.token:
         raise ValueError("Le token d'API n'est pas configuré. Définissez DEMARCHES_API_TOKEN dans le fichier .env")
     
     # Requête GraphQL spécifique pour récupérer les descripteurs de champs
@@ -288,13 +290,13 @@ def get_demarche_schema(demarche_number):
     """
     
     headers = {
-        "Authorization": f"Bearer {API_TOKEN}",
+        "Authorization": f"Bearer {api_config.token}",
         "Content-Type": "application/json"
     }
     
     # Exécuter la requête
     response = requests.post(
-        API_URL,
+        api_config.url,
         json={"query": query, "variables": {"demarcheNumber": int(demarche_number)}},
         headers=headers
     )